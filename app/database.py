@@ -1,10 +1,55 @@
+import os
 from sqlmodel import SQLModel, create_engine, Session
-DATABASE_URL = "sqlite:///./data.db"
-engine = create_engine(DATABASE_URL, echo=False)
+# Shared by the API server and `cli.py init-db`, so both target the same database
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./data.db")
+_engine = None
 
-def init_db():
+def get_engine():
+    # Created on first use so importing the app does not open the database
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL, echo=False)
+    return _engine
+
+def init_db(database_url=None):
     from .models import User, Purchase
-    SQLModel.metadata.create_all(engine)
+    if not database_url:
+        SQLModel.metadata.create_all(get_engine())
+        upgrade_user_table(get_engine())
+        return
+    engine = create_engine(database_url, echo=False)
+    try:
+        SQLModel.metadata.create_all(engine)
+        upgrade_user_table(engine)
+    finally:
+        engine.dispose()
+
+def upgrade_user_table(engine):
+    """Add and backfill lookup columns/indexes missing from a user table created by an older version"""
+    from sqlalchemy import inspect, text
+    from .models import User, lookup_keys
+    columns = {c['name'] for c in inspect(engine).get_columns('user')}
+    with engine.begin() as conn:
+        for name in ('phone_rev', 'address_key'):
+            if name not in columns:
+                conn.execute(text(f'ALTER TABLE "user" ADD COLUMN {name} VARCHAR'))
+        # SQLite has no reverse(), so derive the keys in Python
+        rows = conn.execute(text(
+            'SELECT id, phone, address FROM "user" '
+            'WHERE phone_rev IS NULL OR (address IS NOT NULL AND address_key IS NULL)'
+        )).all()
+        if rows:
+            conn.execute(
+                text('UPDATE "user" SET phone_rev = :phone_rev, address_key = :address_key WHERE id = :id'),
+                [dict(zip(('phone_rev', 'address_key'), lookup_keys(phone, address)), id=id)
+                 for id, phone, address in rows]
+            )
+    for index in User.__table__.indexes:
+        index.create(engine, checkfirst=True)
 
 def get_session():
-    return Session(engine)
+    return Session(get_engine())
+
+if __name__ == '__main__':
+    init_db()
+    print(f"Database schema created in {DATABASE_URL}.")
@@ -1,7 +1,5 @@
-import json
 from .database import get_session
 from .models import User, Purchase
-from pathlib import Path
 from sqlmodel import select
 
 # Note: We'll provide a simple loader that can load data.js similarly to the Node script
@@ -1,15 +1,13 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from .database import init_db, get_session
+from fastapi import FastAPI, HTTPException, Query
+from .database import get_session
 from .models import User, Purchase
-from .schemas import UserOut
-from typing import List
 from sqlmodel import select
-from sqlalchemy import func
-import csv, io, json
+from sqlalchemy import func, and_
 import re
 
+# Schema is created once via `python -m app.database` (or `cli.py init-db`),
+# not on every worker start.
 app = FastAPI(title="退款查询系统 API")
-init_db()
 
 def parse_date_string(date_str):
     """Parse various date formats to datetime object"""
@@ -70,6 +68,48 @@ def overview():
         'not_due_total': round(not_due_total,2)
     }
 
+def prefix_match(column, prefix):
+    """Range condition equivalent to LIKE 'prefix%' that can use the column index"""
+    return and_(column >= prefix, column < prefix + '\U0010ffff')
+
+@app.get('/api/users/search')
+def search_users(q: str, limit: int = Query(20, ge=1, le=100)):
+    """Ranked partial lookup by phone prefix, phone suffix (e.g. last 4) or address prefix"""
+    q = q.strip()
+    if len(q) < 3:
+        raise HTTPException(status_code=422, detail='q must be at least 3 non-blank characters')
+    q_address = q.lower()
+    session = get_session()
+    # rank: 0 exact, 1 phone prefix, 2 phone suffix, 3 address prefix
+    lookups = [
+        (1, User.phone, q),
+        (2, User.phone_rev, q[::-1]),
+        (3, User.address_key, q_address),
+    ]
+    sort_columns = ['phone', 'phone', 'phone_rev', 'address_key']
+    matches = {}
+    for rank, column, prefix in lookups:
+        stmt = select(User).where(prefix_match(column, prefix)).order_by(column).limit(limit)
+        for user in session.exec(stmt).all():
+            user_rank = 0 if q == user.phone or q_address == user.address_key else rank
+            best = matches.get(user.id)
+            if best is None or user_rank < best[0]:
+                # Sort each rank by the column its lookup was ordered by, so a
+                # smaller limit always returns a prefix of a larger one
+                sort_value = getattr(user, sort_columns[user_rank])
+                matches[user.id] = (user_rank, sort_value, user)
+    session.close()
+    ranked = sorted(matches.values(), key=lambda m: m[:2])[:limit]
+    match_types = ['exact', 'phone_prefix', 'phone_suffix', 'address_prefix']
+    return {
+        'query': q,
+        'count': len(ranked),
+        'results': [
+            {'phone': u.phone, 'address': u.address, 'match': match_types[rank]}
+            for rank, _, u in ranked
+        ]
+    }
+
 @app.get('/api/user')
 def get_user(phone: str):
     session = get_session()
@@ -1,14 +1,29 @@
 from typing import Optional
 from sqlmodel import SQLModel, Field
+from sqlalchemy import event
 from datetime import datetime, timezone
 
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     phone: str = Field(index=True, unique=True)
     address: Optional[str] = None
+    # Derived lookup keys, kept in sync with phone/address by derive_lookup_keys:
+    # reversed phone so suffix lookups (e.g. last 4 digits) become indexed prefix scans,
+    # lowercased address so checksummed 0x addresses match regardless of case
+    phone_rev: Optional[str] = Field(default=None, index=True)
+    address_key: Optional[str] = Field(default=None, index=True)
     name: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+def lookup_keys(phone, address):
+    """Return (phone_rev, address_key) derived from phone and address"""
+    return (phone[::-1] if phone else None, address.lower() if address else None)
+
+@event.listens_for(User, 'before_insert')
+@event.listens_for(User, 'before_update')
+def derive_lookup_keys(mapper, connection, target):
+    target.phone_rev, target.address_key = lookup_keys(target.phone, target.address)
+
 class Purchase(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(index=True, foreign_key="user.id")
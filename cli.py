@@ -6,8 +6,9 @@ Command-line interface for the query system.
 
 import argparse
 import sys
-import json
-from query_system import QuerySystem
+
+# json and query_system are imported inside main() only once a command that
+# needs them has been parsed, so `--help` and argument errors stay cheap.
 
 
 def main():
@@ -47,12 +48,28 @@ def main():
     sql_parser.add_argument('query', help='SQL query to execute')
     sql_parser.add_argument('--db', default='data.db', help='Database file path')
     
+    # Create API schema command
+    init_parser = subparsers.add_parser('init-db', help='Create the API database schema (run once)')
+    init_parser.add_argument('--db', help='Database file path (default: the API server\'s '
+                             'DATABASE_URL env var, else ./data.db); the server must be started '
+                             'with DATABASE_URL=sqlite:///<path> to use the same file')
+    
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         return
     
+    if args.command == 'init-db':
+        from app.database import init_db, DATABASE_URL
+        database_url = f"sqlite:///{args.db}" if args.db else DATABASE_URL
+        init_db(database_url)
+        print(f"Database schema created in {database_url}.")
+        return
+    
+    import json
+    from query_system import QuerySystem
+    
     # Initialize query system
     qs = QuerySystem(args.db)
     
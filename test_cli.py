@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for CLI startup cost.
+"""
+
+import os
+import sys
+import sqlite3
+import subprocess
+import tempfile
+import unittest
+import importlib.util
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CLI = os.path.join(ROOT, 'cli.py')
+
+# Cumulative import time budget for `import cli`, in microseconds
+CLI_IMPORT_BUDGET_US = 50000
+# Cumulative import time budget for `import app.main` (dominated by FastAPI/SQLModel)
+APP_IMPORT_BUDGET_US = 2000000
+
+HAS_API_DEPS = all(importlib.util.find_spec(m) for m in ('fastapi', 'sqlmodel'))
+
+
+def cumulative_import_time(stderr, module):
+    """Return the cumulative microseconds reported by -X importtime for module."""
+    cumulative = None
+    for line in stderr.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative = int(parts[1])
+    return cumulative
+
+
+def run_python(*args, cwd=ROOT, **env):
+    """Run the interpreter in a subprocess with the repo root importable."""
+    env = dict(os.environ, PYTHONPATH=ROOT, **env)
+    return subprocess.run([sys.executable, *args], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+
+
+def table_names(db_path):
+    """Return the table names in a SQLite database file."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    finally:
+        conn.close()
+
+
+class TestCliStartup(unittest.TestCase):
+    """Test cases for lazy imports in cli.py."""
+    
+    def test_import_is_lazy(self):
+        """Importing cli must not pull in json, csv, sqlite3 or query_system."""
+        code = ("import sys, cli; "
+                "print(','.join(m for m in ('json', 'csv', 'sqlite3', 'query_system') "
+                "if m in sys.modules))")
+        result = run_python('-c', code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+    
+    def test_import_time_budget(self):
+        """Importing cli stays within its import-time budget."""
+        result = run_python('-X', 'importtime', '-c', 'import cli')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        cumulative = cumulative_import_time(result.stderr, 'cli')
+        self.assertIsNotNone(cumulative)
+        self.assertLess(cumulative, CLI_IMPORT_BUDGET_US)
+    
+    def test_init_db_uses_db_argument(self):
+        """init-db creates the schema in the file given by --db."""
+        if not HAS_API_DEPS:
+            self.skipTest('fastapi/sqlmodel not installed')
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'api.db')
+            result = run_python(CLI, 'init-db', '--db', db_path, cwd=tmp)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(table_names(db_path) & {'user', 'purchase'}, {'user', 'purchase'})
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'data.db')))
+    
+    def test_init_db_uses_database_url(self):
+        """Without --db, init-db targets the same DATABASE_URL as the API server."""
+        if not HAS_API_DEPS:
+            self.skipTest('fastapi/sqlmodel not installed')
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'api.db')
+            url = f"sqlite:///{db_path}"
+            result = run_python(CLI, 'init-db', cwd=tmp, DATABASE_URL=url)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(table_names(db_path) & {'user', 'purchase'}, {'user', 'purchase'})
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'data.db')))
+            code = "from app.database import get_engine; print(get_engine().url)"
+            result = run_python('-c', code, cwd=tmp, DATABASE_URL=url)
+            self.assertEqual(result.stdout.strip(), url)
+
+
+@unittest.skipUnless(HAS_API_DEPS, 'fastapi/sqlmodel not installed')
+class TestAppStartup(unittest.TestCase):
+    """Test cases for app.main import side effects."""
+    
+    def test_import_does_not_touch_database(self):
+        """Importing app.main neither creates data.db nor builds the engine."""
+        code = ("import app.main, app.database; "
+                "print(app.database._engine is None)")
+        with tempfile.TemporaryDirectory() as tmp:
+            result = run_python('-c', code, cwd=tmp)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(result.stdout.strip(), 'True')
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'data.db')))
+    
+    def test_import_time_budget(self):
+        """Importing app.main stays within its import-time budget."""
+        with tempfile.TemporaryDirectory() as tmp:
+            result = run_python('-X', 'importtime', '-c', 'import app.main', cwd=tmp)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        cumulative = cumulative_import_time(result.stderr, 'app.main')
+        self.assertIsNotNone(cumulative)
+        self.assertLess(cumulative, APP_IMPORT_BUDGET_US)
+
+
+if __name__ == '__main__':
+    unittest.main()
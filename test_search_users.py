@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the /api/users/search endpoint and user table upgrade.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+import importlib.util
+
+HAS_API_DEPS = all(importlib.util.find_spec(m) for m in ('fastapi', 'sqlmodel', 'httpx'))
+
+if HAS_API_DEPS:
+    from fastapi.testclient import TestClient
+    from sqlmodel import create_engine
+    from app import database
+    from app.main import app
+    from app.models import User
+
+
+@unittest.skipUnless(HAS_API_DEPS, 'fastapi/sqlmodel/httpx not installed')
+class TestSearchUsers(unittest.TestCase):
+    """Test cases for ranked partial user lookup."""
+    
+    def setUp(self):
+        """Set up a temporary API database with sample users."""
+        self.db_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.db_file.name
+        self.db_file.close()
+        self.saved_engine = database._engine
+        database._engine = create_engine(f"sqlite:///{self.db_path}")
+        database.init_db()
+        session = database.get_session()
+        session.add_all([
+            User(phone='13392776413', address='0xAbCd000000000000000000000000000000001111'),
+            User(phone='13300006413', address='0xFFFF000000000000000000000000000000002222'),
+            User(phone='15500001339', address='0x1339000000000000000000000000000000003333'),
+            User(phone='18800000000', address='0xabcd999999999999999999999999999999994444'),
+        ])
+        session.commit()
+        session.close()
+        self.client = TestClient(app)
+    
+    def tearDown(self):
+        """Clean up test database."""
+        database._engine.dispose()
+        database._engine = self.saved_engine
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+    
+    def search(self, q, **params):
+        response = self.client.get('/api/users/search', params={'q': q, **params})
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()['results']
+    
+    def test_last4_suffix(self):
+        results = self.search('6413')
+        self.assertEqual([r['phone'] for r in results], ['13300006413', '13392776413'])
+        self.assertTrue(all(r['match'] == 'phone_suffix' for r in results))
+    
+    def test_phone_prefix(self):
+        results = self.search('13392')
+        self.assertEqual(results, [{
+            'phone': '13392776413',
+            'address': '0xAbCd000000000000000000000000000000001111',
+            'match': 'phone_prefix',
+        }])
+    
+    def test_address_prefix_case_insensitive(self):
+        results = self.search('0xabcd')
+        self.assertEqual([r['phone'] for r in results], ['13392776413', '18800000000'])
+        self.assertTrue(all(r['match'] == 'address_prefix' for r in results))
+    
+    def test_ranking(self):
+        session = database.get_session()
+        session.add_all([
+            User(phone='1339', address='0x9'),
+            User(phone='16600000000', address='1339ABCD'),
+        ])
+        session.commit()
+        session.close()
+        results = self.search('1339')
+        self.assertEqual(
+            [(r['phone'], r['match']) for r in results],
+            [('1339', 'exact'),
+             ('13392776413', 'phone_prefix'),
+             ('15500001339', 'phone_suffix'),
+             ('16600000000', 'address_prefix')]
+        )
+    
+    def test_limit(self):
+        self.assertEqual([r['phone'] for r in self.search('133')], ['13300006413', '13392776413'])
+        self.assertEqual([r['phone'] for r in self.search('133', limit=1)], ['13300006413'])
+        response = self.client.get('/api/users/search', params={'q': '133', 'limit': 101})
+        self.assertEqual(response.status_code, 422)
+    
+    def test_limit_suffix(self):
+        session = database.get_session()
+        session.add_all([
+            User(phone='21100005555', address='0x5'),
+            User(phone='12200005555', address='0x6'),
+        ])
+        session.commit()
+        session.close()
+        # phone order and reversed-phone order disagree for these two
+        full = [r['phone'] for r in self.search('5555', limit=2)]
+        self.assertEqual(full, ['21100005555', '12200005555'])
+        self.assertEqual([r['phone'] for r in self.search('5555', limit=1)], full[:1])
+    
+    def test_limit_address(self):
+        full = [r['phone'] for r in self.search('0xabcd', limit=2)]
+        self.assertEqual(full, ['13392776413', '18800000000'])
+        self.assertEqual([r['phone'] for r in self.search('0xabcd', limit=1)], full[:1])
+    
+    def test_rejects_short_query(self):
+        for q in ['   ', '  64 ', '64']:
+            response = self.client.get('/api/users/search', params={'q': q})
+            self.assertEqual(response.status_code, 422, q)
+    
+    def test_keys_follow_phone_update(self):
+        session = database.get_session()
+        user = session.get(User, 1)
+        user.phone = '17700007777'
+        session.add(user)
+        session.commit()
+        session.close()
+        self.assertEqual([r['phone'] for r in self.search('7777')], ['17700007777'])
+        self.assertEqual([r['phone'] for r in self.search('6413')], ['13300006413'])
+
+
+@unittest.skipUnless(HAS_API_DEPS, 'fastapi/sqlmodel/httpx not installed')
+class TestUpgradeUserTable(unittest.TestCase):
+    """Test cases for upgrading a user table created before the lookup keys."""
+    
+    def setUp(self):
+        """Set up a database with the old user table layout."""
+        self.db_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.db_file.name
+        self.db_file.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('CREATE TABLE user (id INTEGER PRIMARY KEY, phone VARCHAR NOT NULL, '
+                     'address VARCHAR, name VARCHAR, created_at DATETIME NOT NULL)')
+        conn.execute("INSERT INTO user (phone, address, created_at) "
+                     "VALUES ('13392776413', '0xAbCd', '2026-01-01')")
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up test database."""
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+    
+    def test_init_db_adds_and_backfills_keys(self):
+        database.init_db(f"sqlite:///{self.db_path}")
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('SELECT phone_rev, address_key FROM user').fetchone()
+        indexes = {r[1] for r in conn.execute('PRAGMA index_list(user)')}
+        conn.close()
+        self.assertEqual(row, ('31467729331', '0xabcd'))
+        self.assertTrue({'ix_user_phone_rev', 'ix_user_address_key'} <= indexes)
+
+
+if __name__ == '__main__':
+    unittest.main()